@@ -4,7 +4,7 @@ import threading
 from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import uvicorn
 import os
 
@@ -12,13 +12,14 @@ from llm_engine import LLMEngine
 from planner import Planner
 from researcher import Researcher
 from reporter import Reporter
+from cancellation import CancellationToken, JobCancelled
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize DB
-from database import init_db, save_job, get_job, update_job_status, get_all_jobs, delete_job, update_job_title
+from database import init_db, save_job, get_job, update_job_status, get_all_jobs, delete_job, update_job_title, mark_job_stopping
 init_db()
 
 app = FastAPI()
@@ -35,9 +36,14 @@ app.add_middleware(
 # Additional imports for quick mode
 from search_engine import SearchEngine
 
+# In-process cancellation tokens for running jobs, keyed by job id
+active_jobs: Dict[str, CancellationToken] = {}
+active_jobs_lock = threading.Lock()
+
 class ResearchRequest(BaseModel):
     topic: str
     mode: str = "deep" # "deep" or "quick"
+    timeout: Optional[float] = Field(None, gt=0, allow_inf_nan=False) # Job deadline in seconds, None for no limit
 
 class ResearchResponse(BaseModel):
     job_id: str
@@ -49,33 +55,30 @@ class JobStatus(BaseModel):
     report: Optional[str] = None
     sources: List[str] = []
 
-def run_research_task(job_id: str, topic: str, mode: str = "deep"):
+def run_research_task(job_id: str, topic: str, mode: str = "deep", cancel_token: Optional[CancellationToken] = None):
     logger.info(f"Starting job {job_id} for topic: {topic} (Mode: {mode})")
     
     # Local state tracking
     logs = [f"Starting {mode} research on: {topic}"]
     sources = []
     
+    if cancel_token is None:
+        cancel_token = CancellationToken()
+    
     # Initial DB update
     update_job_status(job_id, "running", logs)
     
     try:
         # Initialize Local Engines
-        llm = LLMEngine() 
+        llm = LLMEngine(cancel_token=cancel_token)
         
         if mode == "quick":
             # QUICK MODE: Skip planning, single broad search
             logs.append("Quick Mode: Running broad search...")
             update_job_status(job_id, "researching", logs)
             
-            search_engine = SearchEngine()
+            search_engine = SearchEngine(cancel_token=cancel_token)
             search_results = search_engine.search(topic)
-            
-            # Check for cancellation
-            if get_job(job_id)['status'] == 'stopping':
-                logs.append("Research stopped by user.")
-                update_job_status(job_id, "cancelled", logs)
-                return
 
             # Format results for Reporter
             results = [{
@@ -101,15 +104,12 @@ def run_research_task(job_id: str, topic: str, mode: str = "deep"):
             
             # 2. Research
             update_job_status(job_id, "researching", logs)
-            researcher = Researcher(llm)
+            researcher = Researcher(llm, cancel_token=cancel_token)
             results = []
             
             for i, q in enumerate(questions):
                 # Check for cancellation
-                if get_job(job_id)['status'] == 'stopping':
-                    logs.append("Research stopped by user.")
-                    update_job_status(job_id, "cancelled", logs)
-                    return
+                cancel_token.raise_if_cancelled()
 
                 logs.append(f"Researching: {q}")
                 update_job_status(job_id, "researching", logs)
@@ -126,6 +126,7 @@ def run_research_task(job_id: str, topic: str, mode: str = "deep"):
     
         # Deduplicate sources
         unique_sources = list(set(sources))
+        cancel_token.raise_if_cancelled()
 
         # 3. Report
         logs.append("Synthesizing final report...")
@@ -137,11 +138,26 @@ def run_research_task(job_id: str, topic: str, mode: str = "deep"):
         logs.append("Research completed successfully.")
         update_job_status(job_id, "completed", logs, report=report_content, sources=unique_sources)
 
+    except JobCancelled as e:
+        if e.reason == "timeout":
+            logger.info(f"Job {job_id} exceeded its deadline")
+            logs.append("Research timed out.")
+            update_job_status(job_id, "failed", logs, sources=list(set(sources)))
+        else:
+            logger.info(f"Job {job_id} cancelled")
+            logs.append("Research stopped by user.")
+            update_job_status(job_id, "cancelled", logs, sources=list(set(sources)))
+
     except Exception as e:
         logger.error(f"Job {job_id} failed: {e}")
         logs.append(f"Error: {str(e)}")
         update_job_status(job_id, "failed", logs)
 
+    finally:
+        cancel_token.close()
+        with active_jobs_lock:
+            active_jobs.pop(job_id, None)
+
 @app.post("/api/research", response_model=ResearchResponse)
 async def start_research(req: ResearchRequest):
     job_id = str(uuid.uuid4())
@@ -172,8 +188,12 @@ async def start_research(req: ResearchRequest):
         "sources": []
     })
     
+    cancel_token = CancellationToken(timeout=req.timeout)
+    with active_jobs_lock:
+        active_jobs[job_id] = cancel_token
+    
     # Run in background thread
-    thread = threading.Thread(target=run_research_task, args=(job_id, req.topic, req.mode))
+    thread = threading.Thread(target=run_research_task, args=(job_id, req.topic, req.mode, cancel_token))
     thread.start()
     
     return {"job_id": job_id}
@@ -191,7 +211,16 @@ async def stop_research(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    update_job_status(job_id, "stopping", job.get("logs", []))
+    with active_jobs_lock:
+        cancel_token = active_jobs.get(job_id)
+    if cancel_token is None:
+        # Job is not running in this process (already finished or server restarted)
+        return {"status": job["status"]}
+    
+    # Conditional write: the worker may already have recorded a final status
+    if not mark_job_stopping(job_id):
+        return {"status": get_job(job_id)["status"]}
+    cancel_token.cancel()
     return {"status": "stopping"}
 
 class ChatRequest(BaseModel):
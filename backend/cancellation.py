@@ -0,0 +1,100 @@
+import logging
+import math
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job when its CancellationToken has been triggered,
+    either by the user stopping it or by its deadline passing.
+    """
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    """
+    In-process cancellation flag for a single research job.
+    Checked by the worker thread without touching the database. Blocking
+    calls register callbacks so cancel() can abort them from the thread
+    that requested the stop (or from the deadline timer).
+    """
+    def __init__(self, timeout: Optional[float] = None):
+        if timeout is not None and not (0 < timeout < math.inf):
+            raise ValueError("timeout must be a positive finite number of seconds")
+
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._reason: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self.cancel, args=("timeout",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self, reason: str = "stopped"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the token is cancelled or the timeout elapses.
+        Returns True if the token was cancelled.
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled():
+            raise JobCancelled(self._reason)
+
+    def add_callback(self, callback: Callable[[], None]):
+        """
+        Register a callback to run on cancel(). Runs immediately if the
+        token is already cancelled.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def close(self):
+        """
+        Stop the deadline timer once the job has finished.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _run_callback(self, callback: Callable[[], None]):
+        try:
+            callback()
+        except Exception as e:
+            logger.warning(f"Cancellation callback failed: {e}")
@@ -103,6 +103,23 @@ def update_job_status(job_id: str, status: str, logs: List[str], report: Optiona
     conn.commit()
     conn.close()
 
+def mark_job_stopping(job_id: str) -> bool:
+    """
+    Set status to 'stopping' unless the job has already reached a final state.
+    Returns True if the job was updated.
+    """
+    conn = get_db_connection()
+    c = conn.cursor()
+    c.execute('''
+        UPDATE jobs
+        SET status = 'stopping'
+        WHERE id = ? AND status NOT IN ('completed', 'failed', 'cancelled')
+    ''', (job_id,))
+    updated = c.rowcount > 0
+    conn.commit()
+    conn.close()
+    return updated
+
 def get_all_jobs() -> List[Dict]:
     conn = get_db_connection()
     c = conn.cursor()
@@ -1,13 +1,21 @@
+import socket
+from typing import Optional
 from ollama import Client
 
+from cancellation import CancellationToken, JobCancelled
+
 class LLMEngine:
-    def __init__(self, model="llama3.2:3b"):
+    def __init__(self, model="llama3.2:3b", cancel_token: Optional[CancellationToken] = None):
         self.model = model
-        self.client = Client()
+        self.cancel_token = cancel_token
 
     def chat(self, messages: list, json_mode=False) -> str:
         """
         Send a chat request to Ollama.
+        The response is streamed and aggregated. If the cancel token fires,
+        the socket is shut down, which unblocks the read (even while Ollama
+        is still evaluating the prompt) and drops the connection so Ollama
+        stops the request.
         """
         options = {}
         format = None
@@ -15,14 +23,62 @@ class LLMEngine:
             format = "json"
             options["temperature"] = 0.2 # Lower temp for structures
 
+        cancel_token = self.cancel_token or CancellationToken()
+        cancel_token.raise_if_cancelled()
+
+        sockets = []
+
+        def abort():
+            for sock in sockets:
+                _shutdown_socket(sock)
+
+        def trace(event: str, info: dict):
+            # httpcore reports each new connection; keep its socket so abort() can reach it
+            if event == "connection.connect_tcp.complete":
+                sock = info["return_value"].get_extra_info("socket")
+                if sock is not None:
+                    sockets.append(sock)
+                    if cancel_token.is_cancelled():
+                        _shutdown_socket(sock)
+
+        def attach_trace(request):
+            request.extensions["trace"] = trace
+
+        # A fresh client per call, so the connection is never shared with another request
+        client = Client(event_hooks={"request": [attach_trace]})
+        cancel_token.add_callback(abort)
+
+        stream = None
         try:
-            response = self.client.chat(
+            stream = client.chat(
                 model=self.model,
                 messages=messages,
                 format=format,
-                options=options
+                options=options,
+                stream=True
             )
-            return response['message']['content']
+            content = []
+            for chunk in stream:
+                cancel_token.raise_if_cancelled()
+                content.append(chunk['message']['content'])
+            return "".join(content)
+        except JobCancelled:
+            raise
         except Exception as e:
+            # A read broken by abort() is a cancellation, not an LLM error
+            cancel_token.raise_if_cancelled()
             print(f"Error calling Ollama ({self.model}): {e}")
             raise e
+        finally:
+            cancel_token.remove_callback(abort)
+            if stream is not None:
+                stream.close()
+            client.close()
+
+
+def _shutdown_socket(sock: socket.socket):
+    # shutdown() (unlike close()) wakes a recv blocked in another thread
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
@@ -1,13 +1,15 @@
+from typing import Optional
 from llm_engine import LLMEngine
 from search_engine import SearchEngine
+from cancellation import CancellationToken
 from rich.console import Console
 
 console = Console()
 
 class Researcher:
-    def __init__(self, llm: LLMEngine):
+    def __init__(self, llm: LLMEngine, cancel_token: Optional[CancellationToken] = None):
         self.llm = llm
-        self.search_engine = SearchEngine()
+        self.search_engine = SearchEngine(cancel_token=cancel_token)
 
     def research_question(self, question: str) -> dict:
         """
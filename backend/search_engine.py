@@ -1,20 +1,50 @@
+import threading
+from typing import Optional
 from duckduckgo_search import DDGS
 
+from cancellation import CancellationToken
+
 class SearchEngine:
-    def __init__(self):
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
         self.ddgs = DDGS()
+        self.cancel_token = cancel_token
 
     def search(self, query: str, max_results=5) -> list:
         """
         Perform a web search using DuckDuckGo.
         Returns a list of dicts: [{'title':, 'href':, 'body':}]
+        With a cancel token attached, the search runs in a helper thread and
+        JobCancelled is raised as soon as the token fires. The abandoned
+        request finishes on its own within the DDGS timeout.
         """
+        if self.cancel_token is None:
+            return self._search(query, max_results)
+
+        self.cancel_token.raise_if_cancelled()
+
+        done = threading.Event()
+        outcome = {"results": []}
+
+        def run():
+            outcome["results"] = self._search(query, max_results)
+            done.set()
+
+        worker = threading.Thread(target=run, daemon=True)
+        self.cancel_token.add_callback(done.set)
+        try:
+            worker.start()
+            done.wait()
+        finally:
+            self.cancel_token.remove_callback(done.set)
+
+        self.cancel_token.raise_if_cancelled()
+        return outcome["results"]
+
+    def _search(self, query: str, max_results: int) -> list:
         print(f"Searching: {query}")
         results = []
         try:
-            # DDGS text search generator
-            search_gen = self.ddgs.text(query, max_results=max_results)
-            for r in search_gen:
+            for r in self.ddgs.text(query, max_results=max_results):
                 results.append({
                     "title": r.get('title'),
                     "href": r.get('href'),
@@ -22,5 +52,5 @@ class SearchEngine:
                 })
         except Exception as e:
             print(f"Search failed: {e}")
-        
+
         return results
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Backend modules use flat imports (e.g. `from llm_engine import LLMEngine`)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    import database
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    database.init_db()
+    return database
+
+
+@pytest.fixture
+def api(db):
+    import api
+    return api
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from cancellation import CancellationToken, JobCancelled
+
+
+class StubLLM:
+    def __init__(self, cancel_token=None):
+        self.cancel_token = cancel_token
+
+
+class StubSearchEngine:
+    def __init__(self, cancel_token=None):
+        self.cancel_token = cancel_token
+
+    def search(self, query, max_results=5):
+        return [{"title": "T", "href": "https://example.com", "body": "B"}]
+
+
+def make_reporter(on_report):
+    class StubReporter:
+        def __init__(self, llm):
+            self.llm = llm
+
+        def generate_report(self, topic, results):
+            return on_report(self.llm.cancel_token)
+
+    return StubReporter
+
+
+def start_job(api, job_id, timeout=None):
+    api.save_job({"id": job_id, "topic": "t", "status": "queued", "logs": [], "report": None, "sources": []})
+    token = CancellationToken(timeout=timeout)
+    api.active_jobs[job_id] = token
+    return token
+
+
+@pytest.fixture
+def stubbed(api, monkeypatch):
+    monkeypatch.setattr(api, "LLMEngine", StubLLM)
+    monkeypatch.setattr(api, "SearchEngine", StubSearchEngine)
+    return api
+
+
+def test_completed_job_is_cleaned_up(stubbed, monkeypatch):
+    api = stubbed
+    monkeypatch.setattr(api, "Reporter", make_reporter(lambda token: "# Report"))
+    token = start_job(api, "job")
+
+    api.run_research_task("job", "t", "quick", token)
+
+    job = api.get_job("job")
+    assert job["status"] == "completed"
+    assert job["report"] == "# Report"
+    assert "job" not in api.active_jobs
+
+
+def test_stop_during_report_marks_cancelled(stubbed, monkeypatch):
+    api = stubbed
+
+    def report(token):
+        asyncio.run(api.stop_research("job"))
+        token.raise_if_cancelled()
+
+    monkeypatch.setattr(api, "Reporter", make_reporter(report))
+    token = start_job(api, "job")
+
+    api.run_research_task("job", "t", "quick", token)
+
+    job = api.get_job("job")
+    assert job["status"] == "cancelled"
+    assert job["logs"][-1] == "Research stopped by user."
+    assert "job" not in api.active_jobs
+
+
+def test_deadline_marks_failed(stubbed, monkeypatch):
+    api = stubbed
+
+    def report(token):
+        token.wait(2)
+        token.raise_if_cancelled()
+
+    monkeypatch.setattr(api, "Reporter", make_reporter(report))
+    token = start_job(api, "job", timeout=0.05)
+
+    api.run_research_task("job", "t", "quick", token)
+
+    job = api.get_job("job")
+    assert job["status"] == "failed"
+    assert job["logs"][-1] == "Research timed out."
+    assert "job" not in api.active_jobs
+
+
+def test_stop_unknown_job_is_404(api):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(api.stop_research("missing"))
+    assert exc.value.status_code == 404
+
+
+def test_stop_finished_job_keeps_status(api):
+    api.save_job({"id": "job", "topic": "t", "status": "completed", "logs": [], "report": "r", "sources": []})
+    assert asyncio.run(api.stop_research("job")) == {"status": "completed"}
+    assert api.get_job("job")["status"] == "completed"
+
+
+def test_stop_does_not_override_final_status_written_by_worker(api):
+    token = start_job(api, "job")
+    # Worker finished but has not yet removed its token from active_jobs
+    api.update_job_status("job", "completed", [], report="r")
+
+    assert asyncio.run(api.stop_research("job")) == {"status": "completed"}
+    assert api.get_job("job")["status"] == "completed"
+    assert not token.is_cancelled()
+    api.active_jobs.pop("job")
+
+
+@pytest.mark.parametrize("timeout", [0, -5, float("nan"), float("inf")])
+def test_request_rejects_invalid_timeout(api, timeout):
+    with pytest.raises(ValidationError):
+        api.ResearchRequest(topic="t", timeout=timeout)
@@ -0,0 +1,70 @@
+import math
+import time
+
+import pytest
+
+from cancellation import CancellationToken, JobCancelled
+
+
+def test_cancel_sets_reason_once():
+    token = CancellationToken()
+    assert not token.is_cancelled()
+    token.cancel()
+    token.cancel("timeout")
+    assert token.is_cancelled()
+    assert token.reason == "stopped"
+    with pytest.raises(JobCancelled) as exc:
+        token.raise_if_cancelled()
+    assert exc.value.reason == "stopped"
+
+
+def test_deadline_expires_with_timeout_reason():
+    token = CancellationToken(timeout=0.05)
+    assert not token.is_cancelled()
+    assert token.wait(1)
+    assert token.reason == "timeout"
+
+
+def test_close_stops_deadline_timer():
+    token = CancellationToken(timeout=0.05)
+    token.close()
+    assert not token.wait(0.1)
+
+
+@pytest.mark.parametrize("timeout", [0, -1, math.nan, math.inf])
+def test_rejects_invalid_timeout(timeout):
+    with pytest.raises(ValueError):
+        CancellationToken(timeout=timeout)
+
+
+def test_callbacks_run_on_cancel_and_deadline():
+    calls = []
+    token = CancellationToken()
+    token.add_callback(lambda: calls.append("a"))
+    removed = lambda: calls.append("removed")
+    token.add_callback(removed)
+    token.remove_callback(removed)
+    token.cancel()
+    assert calls == ["a"]
+
+    timed = CancellationToken(timeout=0.05)
+    timed.add_callback(lambda: calls.append("deadline"))
+    time.sleep(0.2)
+    assert calls == ["a", "deadline"]
+
+
+def test_callback_added_after_cancel_runs_immediately():
+    calls = []
+    token = CancellationToken()
+    token.cancel()
+    token.add_callback(lambda: calls.append("late"))
+    assert calls == ["late"]
+
+
+def test_failing_callback_does_not_block_others():
+    calls = []
+    token = CancellationToken()
+    token.add_callback(lambda: 1 / 0)
+    token.add_callback(lambda: calls.append("ok"))
+    token.cancel()
+    assert calls == ["ok"]
@@ -0,0 +1,83 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import llm_engine
+from cancellation import CancellationToken, JobCancelled
+from llm_engine import LLMEngine
+
+
+class StubClient:
+    def __init__(self, chunks, on_chunk=None, **kwargs):
+        self.chunks = chunks
+        self.on_chunk = on_chunk
+        self.closed = False
+
+    def chat(self, stream=False, **kwargs):
+        assert stream
+        for i, text in enumerate(self.chunks):
+            if self.on_chunk:
+                self.on_chunk(i)
+            yield {"message": {"content": text}}
+
+    def close(self):
+        self.closed = True
+
+
+def test_chat_aggregates_stream(monkeypatch):
+    monkeypatch.setattr(llm_engine, "Client", lambda **kwargs: StubClient(["Hel", "lo"]))
+    assert LLMEngine().chat([{"role": "user", "content": "hi"}]) == "Hello"
+
+
+def test_chat_stops_mid_stream(monkeypatch):
+    token = CancellationToken()
+    clients = []
+
+    def make_client(**kwargs):
+        client = StubClient(["a", "b", "c"], on_chunk=lambda i: i == 1 and token.cancel())
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(llm_engine, "Client", make_client)
+    with pytest.raises(JobCancelled):
+        LLMEngine(cancel_token=token).chat([])
+    assert clients[0].closed
+
+
+def test_chat_skips_request_when_already_cancelled(monkeypatch):
+    monkeypatch.setattr(llm_engine, "Client", lambda **kwargs: pytest.fail("request sent"))
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(JobCancelled):
+        LLMEngine(cancel_token=token).chat([])
+
+
+def test_cancel_aborts_request_waiting_for_first_token(monkeypatch):
+    # A server that accepts the request but never answers, like Ollama evaluating a long prompt
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    monkeypatch.setenv("OLLAMA_HOST", "http://127.0.0.1:%d" % server.getsockname()[1])
+
+    disconnected = threading.Event()
+
+    def serve():
+        conn, _ = server.accept()
+        while conn.recv(4096):
+            pass
+        disconnected.set()
+        conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(JobCancelled):
+        LLMEngine(cancel_token=token).chat([{"role": "user", "content": "hi"}])
+
+    assert time.monotonic() - started < 2
+    assert disconnected.wait(2)
+    server.close()
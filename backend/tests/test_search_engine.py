@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+import search_engine
+from cancellation import CancellationToken, JobCancelled
+from search_engine import SearchEngine
+
+
+class StubDDGS:
+    def __init__(self, release=None):
+        self.release = release
+
+    def text(self, query, max_results=5):
+        if self.release is not None:
+            self.release.wait(5)
+        return [{"title": "T", "href": "https://example.com", "body": "B"}]
+
+
+def test_search_returns_results(monkeypatch):
+    monkeypatch.setattr(search_engine, "DDGS", StubDDGS)
+    results = SearchEngine(cancel_token=CancellationToken()).search("q")
+    assert results == [{"title": "T", "href": "https://example.com", "body": "B"}]
+
+
+def test_cancel_interrupts_blocked_search(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(search_engine, "DDGS", lambda: StubDDGS(release))
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(JobCancelled):
+        SearchEngine(cancel_token=token).search("q")
+    assert time.monotonic() - started < 1
+    release.set()
+
+
+def test_deadline_interrupts_blocked_search(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(search_engine, "DDGS", lambda: StubDDGS(release))
+
+    with pytest.raises(JobCancelled) as exc:
+        SearchEngine(cancel_token=CancellationToken(timeout=0.1)).search("q")
+    assert exc.value.reason == "timeout"
+    release.set()